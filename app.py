@@ -1,20 +1,39 @@
 # app.py
-from _future_ import annotations
+from __future__ import annotations
 
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
+from pathlib import Path
 from urllib.parse import urljoin, urlparse, quote_plus
 from typing import List, Optional, Dict, Union
 
-import json
+import asyncio
+import contextvars
+import functools
+import hashlib
+import os
 import re
 
+import hishel
 import httpx
-from bs4 import BeautifulSoup
-from fastapi import FastAPI, HTTPException, Query, APIRouter
-from fastapi.responses import HTMLResponse
+import lxml.html
+import orjson
+from bs4 import BeautifulSoup, SoupStrainer
+from fastapi import FastAPI, HTTPException, Query, APIRouter, Request
+from fastapi.responses import HTMLResponse, Response
 from pydantic import BaseModel, AnyHttpUrl
 
+try:
+    import uvloop
+except ImportError:  # uvloop doesn't build on Windows
+    uvloop = None
+else:
+    # Swap the stdlib selector loop for libuv before the app (and its
+    # lifespan tasks) are created; every gather below runs on it.
+    uvloop.install()
+
 
 
 TAGS_METADATA = [
@@ -23,6 +42,38 @@ TAGS_METADATA = [
     {"name": "Competitors", "description": "Lightweight competitor discovery and insights."},
 ]
 
+# Pool for CPU-bound parse work (BeautifulSoup on big pages, catalog item
+# conversion) so the event loop keeps servicing I/O while we parse. Created
+# in lifespan; helpers fall back to inline parsing when it's absent.
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _executor
+    _executor = ThreadPoolExecutor(max_workers=(os.cpu_count() or 4) * 2)
+    app.state.executor = _executor
+    # One pooled client for the app lifetime: requests to the same storefront
+    # reuse a single TLS connection (and multiplex over HTTP/2) instead of
+    # re-handshaking per sub-request. The hishel wrapper adds an on-disk
+    # RFC-9111 cache, so repeat /insights calls for a brand turn unchanged
+    # pages into conditional GETs (ETag/Last-Modified) with no body.
+    app.state.client = hishel.AsyncCacheClient(
+        storage=hishel.AsyncFileStorage(base_path=Path(".http_cache"), ttl=86400),
+        controller=hishel.Controller(allow_heuristics=True, allow_stale=True),
+        http2=True,
+        timeout=20,
+        limits=httpx.Limits(max_keepalive_connections=64, max_connections=128, keepalive_expiry=30),
+        headers={"User-Agent": "ShopifyInsightsDemo/1.0"},
+    )
+    try:
+        yield
+    finally:
+        await app.state.client.aclose()
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
 app = FastAPI(
     title="Shopify Insights (No API)",
     version="0.2.0",
@@ -31,6 +82,7 @@ app = FastAPI(
         "catalog, hero products, policies, FAQs, socials, contact, about, important links, plus basic competitor discovery."
     ),
     openapi_tags=TAGS_METADATA,
+    lifespan=lifespan,
     swagger_ui_parameters={
         "defaultModelsExpandDepth": -1,   
         "docExpansion": "list",           
@@ -94,49 +146,169 @@ SOCIAL_MAP = {
     "linkedin.com": "linkedin",
 }
 
+# All social domains compiled into one multi-literal scanner; a single
+# linear pass over an href decides whether it's worth URL-parsing at all.
+SOCIAL_HINT_RE = re.compile("|".join(re.escape(dom) for dom in SOCIAL_MAP))
+
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
-PHONE_RE = re.compile(r"\+?\d[\d\-\s()]{6,}\d")
+# Anchored around grouping/separator structure so arbitrary numeric runs
+# (prices, order ids) don't match and the engine doesn't backtrack on them.
+PHONE_RE = re.compile(r"(?:\+\d{1,3}[\s.-]?)?(?:\(\d{1,5}\)[\s.-]?|\d{2,5}[\s.-])\d{3,5}(?:[\s.-]\d{3,5})?")
+
+# Parse filters: only build tree nodes for the tags each scraper actually
+# queries, instead of materializing the whole DOM.
+STRAINER_LINKS = SoupStrainer(["a", "title", "meta"])
+STRAINER_FAQ = SoupStrainer(["script", "details", "summary"])
+STRAINER_CONTACT = SoupStrainer(["a", "body"])
+
+# Absolute hrefs in raw search-result HTML; one compiled scan over the bytes
+# is far cheaper than building a tree for a page we only mine for links.
+HREF_RE = re.compile(rb'href="(https?://[^"#?]+)[^"]*"')
 
 
 
+_WS_RE = re.compile(r"\s+")
+
+
 def text_excerpt(s: str, n: int = 800) -> str:
-    s = " ".join((s or "").split())
-    return s[:n]
+    if not s:
+        return ""
+    # Collapsing can only shrink the text, so 4n raw characters is plenty to
+    # yield n collapsed ones — no need to scan a whole 100KB policy page.
+    return _WS_RE.sub(" ", s[: n * 4]).strip()[:n]
 
 
+@functools.lru_cache(maxsize=4096)
 def classify_social(href: str) -> Optional[str]:
     host = urlparse(href).netloc.lower()
-    for dom, key in SOCIAL_MAP.items():
-        if dom in host:
-            return key
+    if host.startswith("www."):
+        host = host[4:]
+    # Walk host suffixes (m.facebook.com -> facebook.com -> com) so each
+    # candidate is a single dict lookup instead of a scan over SOCIAL_MAP.
+    while host:
+        if host in SOCIAL_MAP:
+            return SOCIAL_MAP[host]
+        host = host.partition(".")[2]
     return None
 
 
-def absolutize(base: str, href: Optional[str]) -> Optional[str]:
-    return urljoin(base, href) if href else None
+def _join(base: str, path: str) -> str:
+    """Concatenate a root-relative path onto a normalized base.
 
+    The scrapers only ever join fixed paths like /pages/contact onto a base
+    that ends with "/", so plain concatenation matches urljoin without its
+    two urlparse calls.
+    """
+    return base + path.lstrip("/")
 
+
+def absolutize(base: str, href: Optional[str]) -> Optional[str]:
+    if not href:
+        return None
+    # Fast paths for the common href shapes; urljoin only for the rest
+    # (../ and other genuinely relative references).
+    if href.startswith(("http://", "https://")):
+        return href
+    if href.startswith("//"):
+        return "https:" + href
+    if href.startswith("/"):
+        return _join(base, href)
+    return urljoin(base, href)
+
+
+@functools.lru_cache(maxsize=1024)
 def normalize_root(url: str) -> str:
     """Return scheme+host root, always ending with a slash."""
     p = urlparse(url)
     return f"{p.scheme}://{p.netloc}/"
 
 
-def fetch_html(client: httpx.Client, base: str, path: str) -> Optional[BeautifulSoup]:
+# Cap in-flight requests per host: the gathers above can fan out dozens of
+# fetches at once, and an unbounded burst against one storefront invites
+# rate-limiting and starves the connection pool.
+HOST_CONCURRENCY = 8
+_host_sems: Dict[str, asyncio.Semaphore] = {}
+
+
+def _sem_for(url: str) -> asyncio.Semaphore:
+    host = urlparse(url).netloc
+    sem = _host_sems.get(host)
+    if sem is None:
+        sem = _host_sems.setdefault(host, asyncio.Semaphore(HOST_CONCURRENCY))
+    return sem
+
+
+# Per-crawl memo of parsed pages, so two scrapers probing the same path
+# (e.g. /pages/contact) share one fetch+parse. Set by get_brand_context;
+# child tasks spawned under it inherit the same dict via the contextvar.
+_page_cache: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("_page_cache", default=None)
+
+
+async def _fetch_html_uncached(
+    client: httpx.AsyncClient, url: str, strainer: Optional[SoupStrainer]
+) -> Optional[BeautifulSoup]:
     try:
-        r = client.get(urljoin(base, path), follow_redirects=True)
+        async with _sem_for(url):
+            r = await client.get(url, follow_redirects=True)
         if r.status_code == 200:
-            return BeautifulSoup(r.text, "lxml")
+            if _executor is not None:
+                return await asyncio.get_running_loop().run_in_executor(
+                    _executor, functools.partial(BeautifulSoup, r.text, "lxml", parse_only=strainer)
+                )
+            return BeautifulSoup(r.text, "lxml", parse_only=strainer)
     except httpx.RequestError:
         pass
     return None
 
 
-def fetch_json_ok(client: httpx.Client, url: str) -> Optional[dict]:
+async def fetch_html(
+    client: httpx.AsyncClient, base: str, path: str, strainer: Optional[SoupStrainer] = None
+) -> Optional[BeautifulSoup]:
+    url = _join(base, path)
+    cache = _page_cache.get()
+    if cache is None:
+        return await _fetch_html_uncached(client, url, strainer)
+    # Cache the in-flight task (not just the result) so scrapers racing for
+    # the same page under one gather still share a single fetch. Strainers
+    # yield different trees for the same URL, so they key the cache too.
+    key = (url, strainer)
+    task = cache.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_html_uncached(client, url, strainer))
+        cache[key] = task
+    return await task
+
+
+async def fetch_text_only(client: httpx.AsyncClient, base: str, path: str, n: int = 800) -> Optional[str]:
+    """Fetch a page and return its collapsed text, skipping BeautifulSoup.
+
+    Pages that only feed text_excerpt don't need a queryable tree; lxml's
+    C-level text_content() walk is much cheaper than a bs4 get_text().
+    """
+    url = _join(base, path)
     try:
-        r = client.get(url, follow_redirects=True)
+        async with _sem_for(url):
+            r = await client.get(url, follow_redirects=True)
+    except httpx.RequestError:
+        return None
+    if r.status_code != 200 or not r.text:
+        return None
+    try:
+        doc = lxml.html.fromstring(r.text)
+    except Exception:
+        return None
+    # Space-join the text nodes so adjacent elements don't run together,
+    # matching what get_text(" ", strip=True) used to produce.
+    return text_excerpt(" ".join(doc.itertext()), n)
+
+
+async def fetch_json_ok(client: httpx.AsyncClient, url: str) -> Optional[dict]:
+    try:
+        # /products.json is live inventory; don't serve it from the HTTP cache.
+        async with _sem_for(url):
+            r = await client.get(url, follow_redirects=True, extensions={"cache_disabled": True})
         if r.status_code == 200:
-            return r.json()
+            return orjson.loads(r.content)
     except Exception:
         return None
     return None
@@ -156,8 +328,10 @@ def scrape_hero_products(base: str, soup: Optional[BeautifulSoup]) -> List[Produ
     if not soup:
         return []
     seen, out = set(), []
-    for a in soup.select('a[href*="/products/"]'):
-        href = absolutize(base, a.get("href"))
+    for a in soup.find_all("a", href=True):
+        if "/products/" not in a["href"]:
+            continue
+        href = absolutize(base, a["href"])
         if not href or href in seen:
             continue
         title = (a.get("title") or a.get_text(" ", strip=True) or "").strip()
@@ -173,40 +347,67 @@ def scrape_hero_products(base: str, soup: Optional[BeautifulSoup]) -> List[Produ
     return out
 
 
-def scrape_catalog(client: httpx.Client, base: str) -> List[Product]:
+CATALOG_PAGE_BURST = 4
+
+
+def _parse_items(items: list, base: str) -> List[Product]:
+    out: List[Product] = []
+    for it in items:
+        handle = it.get("handle")
+        url = absolutize(base, f"/products/{handle}") if handle else None
+        image = None
+        if it.get("image") and it["image"].get("src"):
+            image = absolutize(base, it["image"]["src"])
+        price = None
+        if it.get("variants"):
+            v0 = it["variants"][0]
+            if v0.get("price"):
+                try:
+                    price = float(v0["price"])
+                except ValueError:
+                    pass
+        # These fields were just normalized above (str title, absolute URLs,
+        # float-or-None price), so skip the per-item validation pass; the
+        # response model still validates at the API boundary.
+        out.append(Product.model_construct(title=(it.get("title") or "").strip(), url=url, price=price, image=image))
+    return out
+
+
+async def scrape_catalog(client: httpx.AsyncClient, base: str) -> List[Product]:
     products: List[Product] = []
     page = 1
+    # Speculatively fetch a burst of pages at a time; a catalog with N pages
+    # of 250 products costs ~N/BURST round-trips instead of N.
+    async def _get_page(u: str) -> httpx.Response:
+        async with _sem_for(u):
+            return await client.get(u, follow_redirects=True, extensions={"cache_disabled": True})
+
     while True:
-        try:
-            r = client.get(urljoin(base, f"/products.json?limit=250&page={page}"), follow_redirects=True)
-            if r.status_code != 200:
-                break
-            data = r.json()
-            items = data.get("products", [])
+        urls = [_join(base, f"/products.json?limit=250&page={page + i}") for i in range(CATALOG_PAGE_BURST)]
+        resps = await asyncio.gather(*(_get_page(u) for u in urls), return_exceptions=True)
+        got_empty = False
+        for r in resps:
+            items = []
+            if not isinstance(r, Exception) and r.status_code == 200:
+                try:
+                    items = orjson.loads(r.content).get("products", [])
+                except Exception:
+                    items = []
             if not items:
+                got_empty = True
                 break
-            for it in items:
-                handle = it.get("handle")
-                url = absolutize(base, f"/products/{handle}") if handle else None
-                image = None
-                if it.get("image") and it["image"].get("src"):
-                    image = absolutize(base, it["image"]["src"])
-                price = None
-                if it.get("variants"):
-                    v0 = it["variants"][0]
-                    if v0.get("price"):
-                        try:
-                            price = float(v0["price"])
-                        except ValueError:
-                            pass
-                products.append(Product(title=(it.get("title") or "").strip(), url=url, price=price, image=image))
-            page += 1
-        except Exception:
+            if _executor is not None:
+                parsed = await asyncio.get_running_loop().run_in_executor(_executor, _parse_items, items, base)
+            else:
+                parsed = _parse_items(items, base)
+            products.extend(parsed)
+        if got_empty:
             break
+        page += CATALOG_PAGE_BURST
     return products
 
 
-def scrape_policies(client: httpx.Client, base: str) -> List[Policy]:
+async def scrape_policies(client: httpx.AsyncClient, base: str) -> List[Policy]:
     paths = [
         ("privacy", "/policies/privacy-policy"),
         ("refund", "/policies/refund-policy"),
@@ -214,25 +415,27 @@ def scrape_policies(client: httpx.Client, base: str) -> List[Policy]:
         ("shipping", "/policies/shipping-policy"),
         ("terms", "/policies/terms-of-service"),
     ]
-    out: List[Policy] = []
-    for ptype, path in paths:
-        soup = fetch_html(client, base, path)
-        if soup:
-            out.append(Policy(type=ptype, url=urljoin(base, path),
-                              text_excerpt=text_excerpt(soup.get_text(" ", strip=True))))
-    return out
+    excerpts = await asyncio.gather(*(fetch_text_only(client, base, path) for _, path in paths))
+    return [
+        Policy(type=ptype, url=_join(base, path), text_excerpt=excerpt)
+        for (ptype, path), excerpt in zip(paths, excerpts)
+        if excerpt
+    ]
 
 
-def scrape_faqs(client: httpx.Client, base: str) -> List[FAQItem]:
-    for path in ["/pages/faq", "/pages/faqs", "/pages/help", "/pages/support"]:
-        soup = fetch_html(client, base, path)
+async def scrape_faqs(client: httpx.AsyncClient, base: str) -> List[FAQItem]:
+    paths = ["/pages/faq", "/pages/faqs", "/pages/help", "/pages/support"]
+    # Fetch every candidate concurrently, but keep first-hit-wins in path
+    # order so the preferred page still takes priority over fallbacks.
+    soups = await asyncio.gather(*(fetch_html(client, base, path, STRAINER_FAQ) for path in paths))
+    for path, soup in zip(paths, soups):
         if not soup:
             continue
         faqs: List[FAQItem] = []
         # JSON-LD FAQPage
-        for s in soup.select('script[type="application/ld+json"]'):
+        for s in soup.find_all("script", {"type": "application/ld+json"}):
             try:
-                data = json.loads(s.text)
+                data = orjson.loads(s.text)
                 if isinstance(data, dict) and data.get("@type") == "FAQPage":
                     for ent in data.get("mainEntity", []):
                         q = (ent.get("name") or "").strip()
@@ -241,7 +444,7 @@ def scrape_faqs(client: httpx.Client, base: str) -> List[FAQItem]:
                         if isinstance(aa, dict):
                             a = (aa.get("text") or "").strip()
                         if q and a:
-                            faqs.append(FAQItem(question=q, answer=a, url=urljoin(base, path)))
+                            faqs.append(FAQItem(question=q, answer=a, url=_join(base, path)))
             except Exception:
                 pass
         # <details><summary>
@@ -250,7 +453,7 @@ def scrape_faqs(client: httpx.Client, base: str) -> List[FAQItem]:
             q = (summ.get_text(" ", strip=True) if summ else "").strip()
             a = det.get_text(" ", strip=True)
             if q and a:
-                faqs.append(FAQItem(question=q, answer=a, url=urljoin(base, path)))
+                faqs.append(FAQItem(question=q, answer=a, url=_join(base, path)))
         if faqs:
             return faqs
     return []
@@ -261,28 +464,40 @@ def scrape_social(soup: Optional[BeautifulSoup]) -> Dict[str, Optional[str]]:
         return {}
     out: Dict[str, Optional[str]] = {}
     for a in soup.find_all("a", href=True):
-        key = classify_social(a["href"])
+        href = a["href"]
+        # Most anchors aren't social links; the one-pass literal scan skips
+        # them without paying urlparse + suffix walk in classify_social.
+        if not SOCIAL_HINT_RE.search(href.lower()):
+            continue
+        key = classify_social(href)
         if key and key not in out:
-            out[key] = a["href"]
+            out[key] = href
     return out
 
 
-def scrape_contact(client: httpx.Client, base: str) -> Dict[str, Optional[Union[List[str], str]]]:
+async def scrape_contact(client: httpx.AsyncClient, base: str) -> Dict[str, Optional[Union[List[str], str]]]:
     emails, phones, page_url = [], [], None
     for path in ["/pages/contact", "/pages/contact-us", "/contact"]:
-        soup = fetch_html(client, base, path)
+        soup = await fetch_html(client, base, path, STRAINER_CONTACT)
         if not soup:
             continue
-        txt = soup.get_text(" ", strip=True)
-        emails += EMAIL_RE.findall(txt)
-        phones += PHONE_RE.findall(txt)
-        for a in soup.select('a[href^="mailto:"], a[href^="tel:"]'):
+        # Scan text nodes as the tree yields them rather than concatenating
+        # the whole page into one big get_text() string first.
+        for node in soup.find_all(string=True):
+            s = node.strip()
+            if not s:
+                continue
+            for m in EMAIL_RE.finditer(s):
+                emails.append(m.group())
+            for m in PHONE_RE.finditer(s):
+                phones.append(m.group())
+        for a in soup.find_all("a", href=True):
             href = a["href"]
             if href.startswith("mailto:"):
-                emails.append(href.replace("mailto:", "").strip())
-            if href.startswith("tel:"):
-                phones.append(href.replace("tel:", "").strip())
-        page_url = urljoin(base, path)
+                emails.append(href[7:].strip())
+            elif href.startswith("tel:"):
+                phones.append(href[4:].strip())
+        page_url = _join(base, path)
         break
     return {
         "emails": sorted(set(emails)) or None,
@@ -291,43 +506,54 @@ def scrape_contact(client: httpx.Client, base: str) -> Dict[str, Optional[Union[
     }
 
 
-def scrape_about(client: httpx.Client, base: str) -> Optional[str]:
-    for path in ["/pages/about", "/pages/our-story", "/pages/about-us"]:
-        soup = fetch_html(client, base, path)
-        if soup:
-            return text_excerpt(soup.get_text(" ", strip=True), 1200)
+async def scrape_about(client: httpx.AsyncClient, base: str) -> Optional[str]:
+    paths = ["/pages/about", "/pages/our-story", "/pages/about-us"]
+    excerpts = await asyncio.gather(*(fetch_text_only(client, base, path, 1200) for path in paths))
+    for excerpt in excerpts:
+        if excerpt:
+            return excerpt
     return None
 
 
-def scrape_important_links(client: httpx.Client, base: str) -> Dict[str, Optional[str]]:
+async def scrape_important_links(client: httpx.AsyncClient, base: str) -> Dict[str, Optional[str]]:
     out = {"order_tracking": None, "contact_us": None, "blogs": None}
-    for path, key in [
+    candidates = [
         ("/pages/track", "order_tracking"),
         ("/pages/track-order", "order_tracking"),
         ("/pages/order-tracking", "order_tracking"),
         ("/pages/contact", "contact_us"),
         ("/blogs/news", "blogs"),
         ("/blogs", "blogs"),
-    ]:
-        soup = fetch_html(client, base, path)
+    ]
+    soups = await asyncio.gather(
+        *(fetch_html(client, base, path, STRAINER_CONTACT) for path, _ in candidates)
+    )
+    for (path, key), soup in zip(candidates, soups):
         if soup:
-            out[key] = urljoin(base, path)
+            out[key] = _join(base, path)
     return out
 
 
 
-def get_brand_context(client: httpx.Client, website_url: str) -> BrandContext:
-    base = website_url if website_url.endswith("/") else website_url + "/"
-    home = fetch_html(client, base, "/")
+async def get_brand_context(client: httpx.AsyncClient, website_url: str) -> BrandContext:
+    # Crawl from the host root: the fixed paths (_join) and root-relative
+    # hrefs (absolutize) assume base is scheme://host/, and a path-bearing
+    # input like https://shop.com/en would otherwise skew every fetch.
+    base = normalize_root(website_url)
+    cache_token = _page_cache.set({})
+    home, catalog, policies, faqs, contact, about_text, important_links = await asyncio.gather(
+        fetch_html(client, base, "/", STRAINER_LINKS),
+        scrape_catalog(client, base),
+        scrape_policies(client, base),
+        scrape_faqs(client, base),
+        scrape_contact(client, base),
+        scrape_about(client, base),
+        scrape_important_links(client, base),
+    )
+    _page_cache.reset(cache_token)
     brand_name = scrape_brand_name(home)
     hero_products = scrape_hero_products(base, home)
-    catalog = scrape_catalog(client, base)
-    policies = scrape_policies(client, base)
-    faqs = scrape_faqs(client, base)
     social = scrape_social(home)
-    contact = scrape_contact(client, base)
-    about_text = scrape_about(client, base)
-    important_links = scrape_important_links(client, base)
 
     return BrandContext(
         store_url=base,
@@ -345,15 +571,15 @@ def get_brand_context(client: httpx.Client, website_url: str) -> BrandContext:
 
 
 
-def looks_like_shopify(client: httpx.Client, url: str) -> bool:
+async def looks_like_shopify(client: httpx.AsyncClient, url: str) -> bool:
     root = normalize_root(url)
-    test_url = urljoin(root, "/products.json?limit=1")
-    data = fetch_json_ok(client, test_url)
+    test_url = _join(root, "/products.json?limit=1")
+    data = await fetch_json_ok(client, test_url)
     return isinstance(data, dict) and "products" in data
 
 
-def find_competitor_candidates(
-    client: httpx.Client,
+async def find_competitor_candidates(
+    client: httpx.AsyncClient,
     website_url: str,
     brand_name: Optional[str],
     limit: int = 3
@@ -382,47 +608,37 @@ def find_competitor_candidates(
     for q in queries:
         url = f"https://duckduckgo.com/html/?q={quote_plus(q)}"
         try:
-            r = client.get(url, headers=headers, timeout=15)
+            r = await client.get(url, headers=headers, timeout=15)
             if r.status_code != 200:
                 continue
-            soup = BeautifulSoup(r.text, "lxml")
-            for a in soup.find_all("a", href=True):
-                href = a["href"]
-                if not href.startswith("http"):
-                    continue
-                host = urlparse(href).netloc
-                if not host or host == self_host:
+            for m in HREF_RE.finditer(r.content):
+                href = m.group(1).decode("ascii", "ignore")
+                # One parse per candidate; the root and host both fall out of it.
+                p = urlparse(href)
+                host = p.netloc
+                if not host or host == self_host or host in seen_hosts:
                     continue
-                root_cand = normalize_root(href)
-                h = urlparse(root_cand).netloc
-                if h in seen_hosts:
-                    continue
-                seen_hosts.add(h)
-                candidates.append(root_cand)
+                seen_hosts.add(host)
+                candidates.append(f"{p.scheme}://{host}/")
                 if len(candidates) >= limit * 4:
                     break
         except Exception:
             continue
 
-    filtered: List[str] = []
-    for cand in candidates:
-        if len(filtered) >= limit:
-            break
-        try:
-            if looks_like_shopify(client, cand):
-                filtered.append(cand)
-        except Exception:
-            continue
-
+    # Each probe hits a different host, so run them all at once and keep the
+    # first `limit` confirmed storefronts in candidate order.
+    results = await asyncio.gather(
+        *(looks_like_shopify(client, cand) for cand in candidates), return_exceptions=True
+    )
+    filtered = [cand for cand, ok in zip(candidates, results) if ok is True]
     return filtered[:limit]
 
 
 
-@ui.get("/", response_class=HTMLResponse, tags=["Health"])
-def home():
-    """Simple zero-dependency UI to try the endpoints."""
-    return HTMLResponse(
-        """
+# Encode the landing page once at import; the handler just hands out the
+# same bytes (or a bodyless 304 when the browser already has them).
+_HOME_HTML = (
+    """
 <!doctype html>
 <html lang="en">
 <head>
@@ -507,7 +723,20 @@ def home():
   </script>
 </body>
 </html>
-        """
+    """
+).encode("utf-8")
+_HOME_ETAG = f'"{hashlib.md5(_HOME_HTML).hexdigest()}"'
+
+
+@ui.get("/", response_class=HTMLResponse, tags=["Health"])
+def home(request: Request):
+    """Simple zero-dependency UI to try the endpoints."""
+    if request.headers.get("if-none-match") == _HOME_ETAG:
+        return Response(status_code=304, headers={"ETag": _HOME_ETAG})
+    return Response(
+        content=_HOME_HTML,
+        media_type="text/html",
+        headers={"ETag": _HOME_ETAG, "Cache-Control": "public, max-age=3600"},
     )
 
 
@@ -517,11 +746,14 @@ def health():
 
 
 @api.get("/insights", response_model=BrandContext, tags=["Insights"])
-def insights(website_url: AnyHttpUrl = Query(..., description="Shopify store URL, e.g. https://memy.co.in")):
+async def insights(
+    request: Request,
+    website_url: AnyHttpUrl = Query(..., description="Shopify store URL, e.g. https://memy.co.in"),
+):
     base = str(website_url)
-    client = httpx.Client(timeout=20, headers={"User-Agent": "ShopifyInsightsDemo/1.0"})
+    client = request.app.state.client
     try:
-        ctx = get_brand_context(client, base)
+        ctx = await get_brand_context(client, base)
         if not ctx.catalog and not ctx.hero_products:
             raise HTTPException(status_code=401, detail="Website not found or not a typical Shopify storefront.")
         return ctx
@@ -529,40 +761,36 @@ def insights(website_url: AnyHttpUrl = Query(..., description="Shopify store URL
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal error: {e}")
-    finally:
-        client.close()
 
 
 @api.get("/competitors", response_model=CompetitorResult, tags=["Competitors"])
-def competitors(
+async def competitors(
+    request: Request,
     website_url: AnyHttpUrl = Query(..., description="Brand website (Shopify storefront)"),
     limit: int = Query(3, ge=1, le=5, description="Max competitors to fetch (1–5)")
 ):
     base = str(website_url)
-    client = httpx.Client(timeout=20, headers={"User-Agent": "ShopifyInsightsDemo/1.0"})
+    client = request.app.state.client
     try:
-        brand_ctx = get_brand_context(client, base)
+        brand_ctx = await get_brand_context(client, base)
         if not brand_ctx.catalog and not brand_ctx.hero_products:
             raise HTTPException(status_code=401, detail="Website not found or not a typical Shopify storefront.")
 
-        competitor_urls = find_competitor_candidates(client, str(brand_ctx.store_url), brand_ctx.brand_name, limit=limit)
+        competitor_urls = await find_competitor_candidates(client, str(brand_ctx.store_url), brand_ctx.brand_name, limit=limit)
 
-        competitor_contexts: List[BrandContext] = []
-        for cu in competitor_urls:
-            try:
-                cctx = get_brand_context(client, cu)
-                if cctx.catalog or cctx.hero_products:
-                    competitor_contexts.append(cctx)
-            except Exception:
-                continue
+        contexts = await asyncio.gather(
+            *(get_brand_context(client, cu) for cu in competitor_urls), return_exceptions=True
+        )
+        competitor_contexts = [
+            cctx for cctx in contexts
+            if isinstance(cctx, BrandContext) and (cctx.catalog or cctx.hero_products)
+        ]
 
         return CompetitorResult(brand=brand_ctx, competitors=competitor_contexts)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal error: {e}")
-    finally:
-        client.close()
 
 
 